@@ -15,6 +15,7 @@
 # ├── requirements.txt
 
 # agents/companion_agent.py
+import asyncio
 from utils.helpers import load_instructions
 
 class CompanionAgent:
@@ -22,7 +23,11 @@ class CompanionAgent:
         self.instructions = load_instructions("instructions/companion_instructions.txt")
 
     def run(self, patient_input):
-        # Stub logic (replace with actual LLM call + memory)
+        # Sync entry point for legacy callers outside an event loop
+        return asyncio.run(self.arun(patient_input))
+
+    async def arun(self, patient_input):
+        # Stub logic (replace with actual LLM call + memory, awaited on an async client)
         return {
             "agent_response": "Hi there! It's good to check in with you. How are you feeling today?",
             "detected_emotional_state": "neutral",
@@ -36,6 +41,10 @@ class AdaptiveQuestionnaireAgent:
         self.instructions = load_instructions("instructions/adaptive_questionnaire_instructions.txt")
 
     def run(self, patient_input):
+        # Sync entry point for legacy callers outside an event loop
+        return asyncio.run(self.arun(patient_input))
+
+    async def arun(self, patient_input):
         # Stub logic (replace with context-aware logic)
         return {
             "agent_question": "On a scale from 0 to 10, how much pain have you felt in the past 24 hours?",
@@ -49,6 +58,10 @@ class TrendMonitoringAgent:
         self.instructions = load_instructions("instructions/trend_monitoring_instructions.txt")
 
     def run(self, pro_data):
+        # Sync entry point for legacy callers outside an event loop
+        return asyncio.run(self.arun(pro_data))
+
+    async def arun(self, pro_data):
         risk_flag = pro_data.get("pain_level", 0) > 5
         return {
             "summary": "Patient experiencing moderate pain. Monitor for escalation.",
@@ -56,30 +69,43 @@ class TrendMonitoringAgent:
         }
 
 # utils/helpers.py
+import functools
 
+@functools.lru_cache(maxsize=None)
 def load_instructions(path):
+    # Each instructions file is read from disk once per process
     with open(path, "r") as file:
         return file.read()
 
 # main.py (FastAPI layer)
 from fastapi import FastAPI, Depends
+from fastapi.responses import ORJSONResponse
 from agents.companion_agent import CompanionAgent
 from agents.adaptive_questionnaire_agent import AdaptiveQuestionnaireAgent
 from agents.trend_monitoring_agent import TrendMonitoringAgent
 
-app = FastAPI()
+app = FastAPI(default_response_class=ORJSONResponse)
+
+# Agents are stateless between calls, so one instance of each is built at import and shared by all requests (per worker).
+COMPANION = CompanionAgent()
+QUESTIONNAIRE = AdaptiveQuestionnaireAgent()
+TREND = TrendMonitoringAgent()
 
+# Handlers are async so requests are served on the event loop instead of the threadpool.
+# Run with: gunicorn main:app -k uvicorn.workers.UvicornWorker (or uvicorn main:app --loop uvloop --http httptools)
+# Agent results are returned as ORJSONResponse directly, so FastAPI skips its jsonable_encoder pass
+# and the dicts are serialized once by orjson.
 @app.post("/companion")
-def companion_endpoint(input: dict):
-    return CompanionAgent().run(input)
+async def companion_endpoint(input: dict):
+    return ORJSONResponse(await COMPANION.arun(input))
 
 @app.post("/questionnaire")
-def questionnaire_endpoint(input: dict):
-    return AdaptiveQuestionnaireAgent().run(input)
+async def questionnaire_endpoint(input: dict):
+    return ORJSONResponse(await QUESTIONNAIRE.arun(input))
 
 @app.post("/trend")
-def trend_endpoint(input: dict):
-    return TrendMonitoringAgent().run(input)
+async def trend_endpoint(input: dict):
+    return ORJSONResponse(await TREND.arun(input))
 
 # instructions/companion_instructions.txt
 """
@@ -106,12 +132,13 @@ You are the Trend Monitoring Agent. Your job is to analyze structured PRO data a
 
 # requirements.txt
 fastapi==0.110.0
-uvicorn==0.27.1
+uvicorn[standard]==0.27.1
 SQLAlchemy==2.0.29
 psycopg2-binary==2.9.9
 python-dotenv
 python-multipart
 pydantic==2.6.4
+orjson
 
 # adk.yaml
 name: healthcare-pro-agents
@@ -0,0 +1,54 @@
+import orjson
+
+from agents.base_adk_agent import history_tail_json
+
+
+def _turn(role, text):
+    return {"role": role, "parts": [{"text": text}]}
+
+
+def test_history_tail_json_returns_last_n_turns():
+    history = [_turn("user", f"message {i}") for i in range(10)]
+    assert orjson.loads(history_tail_json(history, 5)) == history[-5:]
+    assert orjson.loads(history_tail_json(history, 7)) == history[-7:]
+
+
+def test_history_tail_json_follows_appended_turns():
+    history = [_turn("user", "hello")]
+    assert orjson.loads(history_tail_json(history, 5)) == history
+    history.append(_turn("model", "hi there"))
+    history.append(_turn("user", "I'm tired today"))
+    assert orjson.loads(history_tail_json(history, 5)) == history
+
+
+def test_history_tail_json_empty_history():
+    assert history_tail_json([], 5) == "[]"
+
+
+def test_history_tail_json_rebuilt_history_in_place():
+    history = [_turn("user", f"old {i}") for i in range(4)]
+    history_tail_json(history, 5)
+    # Same list object, replaced with turns of the same length
+    history[:] = [_turn("user", f"new {i}") for i in range(4)]
+    assert orjson.loads(history_tail_json(history, 5)) == history
+    # ... and with a longer history
+    history[:] = [_turn("model", f"newer {i}") for i in range(6)]
+    assert orjson.loads(history_tail_json(history, 5)) == history[-5:]
+
+
+def test_history_tail_json_shorter_history():
+    history = [_turn("user", f"message {i}") for i in range(6)]
+    history_tail_json(history, 5)
+    del history[3:]
+    assert orjson.loads(history_tail_json(history, 5)) == history
+
+
+def test_history_tail_json_separate_lists_do_not_share_turns():
+    first = [_turn("user", "first patient")]
+    second = [_turn("user", "second patient")]
+    assert orjson.loads(history_tail_json(first, 5)) == first
+    assert orjson.loads(history_tail_json(second, 5)) == second
+    # A copy extended with a new turn, as the adaptive agent builds its prompt history
+    extended = first + [_turn("user", "follow-up")]
+    assert orjson.loads(history_tail_json(extended, 5)) == extended
+    assert orjson.loads(history_tail_json(first, 5)) == first
@@ -0,0 +1,79 @@
+import orjson
+
+from utils.llm_utils import JSONStringFieldStream
+
+# Escapes of every kind: short escapes, an escaped quote, a BMP \uXXXX escape and a surrogate pair
+TRICKY_JSON = (
+    '{"agent_response": "Line one\\nTab\\there \\"quoted\\" back\\\\slash caf\\u00e9 '
+    'smile \\ud83d\\ude00 end", "detected_emotional_state": "calm"}'
+)
+TRICKY_VALUE = orjson.loads(TRICKY_JSON)["agent_response"]
+
+
+def _stream_all(chunks, field="agent_response"):
+    stream = JSONStringFieldStream(field)
+    return "".join(stream.feed(chunk) for chunk in chunks), stream
+
+
+def test_whole_object_in_one_chunk():
+    text = orjson.dumps({"agent_response": "Hello there", "transition_to_adaptive": False}).decode()
+    decoded, stream = _stream_all([text])
+    assert decoded == "Hello there"
+    assert stream.done
+
+
+def test_every_split_point_inside_escapes():
+    for split in range(len(TRICKY_JSON) + 1):
+        decoded, stream = _stream_all([TRICKY_JSON[:split], TRICKY_JSON[split:]])
+        assert decoded == TRICKY_VALUE, split
+        assert stream.done
+
+
+def test_one_character_chunks():
+    decoded, stream = _stream_all(list(TRICKY_JSON))
+    assert decoded == TRICKY_VALUE
+    assert stream.done
+
+
+def test_escape_is_held_back_until_complete():
+    stream = JSONStringFieldStream("agent_response")
+    assert stream.feed('{"agent_response": "caf\\u00') == "caf"
+    assert stream.feed("e9") == "é"
+    assert stream.feed(" \\ud83d") == " "
+    assert stream.feed("\\ude00") == "\U0001F600"
+    assert stream.feed('\\') == ""
+    assert stream.feed('n"}') == "\n"
+    assert stream.done
+
+
+def test_field_after_other_fields():
+    obj = {
+        "detected_emotional_state": 'says "agent_response": "not this"',
+        "pro_intro_statement": "agent_response",
+        "agent_response": "This one",
+        "transition_to_adaptive": True,
+    }
+    text = orjson.dumps(obj).decode()
+    for split in range(len(text) + 1):
+        decoded, _ = _stream_all([text[:split], text[split:]])
+        assert decoded == "This one", split
+
+
+def test_key_split_across_chunks_with_whitespace():
+    decoded, stream = _stream_all(['{"agent_res', 'ponse"  ', ':\n ', '"Hi', ' again"}'])
+    assert decoded == "Hi again"
+    assert stream.done
+
+
+def test_text_after_the_value_is_ignored():
+    stream = JSONStringFieldStream("agent_response")
+    assert stream.feed('{"agent_response": "Done", "pro_intro_statement": "') == "Done"
+    assert stream.feed('more text"}') == ""
+    assert stream.done
+
+
+def test_missing_field():
+    text = orjson.dumps({"detected_emotional_state": "calm", "transition_to_adaptive": False}).decode()
+    decoded, stream = _stream_all([text[:10], text[10:]])
+    assert decoded == ""
+    assert not stream.done
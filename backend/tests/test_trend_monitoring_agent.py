@@ -0,0 +1,63 @@
+import pytest
+
+from agents.trend_monitoring_agent import _summarize_numeric_pros
+
+
+def test_empty_history():
+    assert _summarize_numeric_pros([]) == {}
+
+
+def test_single_entry():
+    summary = _summarize_numeric_pros([{"pain_level": 4, "fatigue_level": 7.5}])
+    assert summary == {
+        "pain_level": {"count": 1, "mean": 4.0, "std": 0.0, "min": 4.0, "max": 4.0},
+        "fatigue_level": {"count": 1, "mean": 7.5, "std": 0.0, "min": 7.5, "max": 7.5},
+    }
+
+
+def test_statistics_and_slope():
+    entries = [{"pain_level": value} for value in (2, 4, 6, 8)]
+    pain = _summarize_numeric_pros(entries)["pain_level"]
+    assert pain["count"] == 4
+    assert pain["mean"] == 5.0
+    assert pain["std"] == pytest.approx(2.24)
+    assert (pain["min"], pain["max"]) == (2.0, 8.0)
+    assert pain["slope_per_entry"] == pytest.approx(2.0)
+
+
+def test_non_numeric_values_are_skipped():
+    entries = [
+        {"pain_level": "severe"},
+        {"pain_level": None},
+        {"pain_level": True},
+        {"pain_level": [3]},
+        {"pain_level": 3},
+        {"pain_level": "5"},
+        {"pain_level": 5},
+    ]
+    pain = _summarize_numeric_pros(entries)["pain_level"]
+    assert pain["count"] == 2
+    assert pain["mean"] == 4.0
+    # The slope is measured per entry, including entries that did not report a usable value
+    assert pain["slope_per_entry"] == pytest.approx(1.0)
+
+
+def test_field_without_numeric_values_is_omitted():
+    summary = _summarize_numeric_pros([{"pain_level": "none", "fatigue_level": 2}])
+    assert "pain_level" not in summary
+    assert summary["fatigue_level"]["count"] == 1
+
+
+def test_mixed_question_ids():
+    entries = [
+        {"pain_level": 2, "sleep_quality": "poor"},
+        {"fatigue_level": 6},
+        {"mood": "low", "appetite": 3},
+        {"pain_level": 6, "fatigue_level": 4},
+    ]
+    summary = _summarize_numeric_pros(entries)
+    assert set(summary) == {"pain_level", "fatigue_level"}
+    assert summary["pain_level"]["count"] == 2
+    assert summary["pain_level"]["slope_per_entry"] == pytest.approx(4 / 3, abs=1e-3)
+    assert summary["fatigue_level"]["count"] == 2
+    assert summary["fatigue_level"]["slope_per_entry"] == pytest.approx(-1.0)
@@ -1,4 +1,5 @@
 import asyncio
+from google.genai import types
 from agents.pipeline import pros_pipeline  # Your SequentialAgent pipeline
 from services.session_service import InMemorySessionService
 from runners.agent_runner import Runner
@@ -44,20 +45,22 @@ async def main_async():
     print("Type your symptom update. Type 'exit' to stop.\n")
 
     while True:
-        user_input = input("You: ").strip()
+        # Read stdin on a worker thread so the event loop keeps running while the user types
+        user_input = (await asyncio.to_thread(input, "You: ")).strip()
 
         if user_input.lower() in ["exit", "quit"]:
             print("Goodbye! Session ended.")
             break
 
-        # Run the pipeline with input
-        result = await runner.run(
+        # Run the pipeline, printing each agent's reply as soon as it finishes
+        # instead of waiting for the whole pipeline
+        async for event in runner.run_async(
             user_id=USER_ID,
             session_id=session_id,
-            input=user_input
-        )
-
-        print(f"\n[System]: {result.output}\n")
+            new_message=types.Content(role="user", parts=[types.Part(text=user_input)])
+        ):
+            if event.is_final_response() and event.content and event.content.parts:
+                print(f"\n[{event.author}]: {event.content.parts[0].text}\n")
 
     # === FINAL STATE ===
     final = session_service.get_session(
@@ -72,6 +75,12 @@ async def main_async():
 
 
 def main():
+    # uvloop is optional (it is not available on Windows): fall back to the default asyncio loop without it
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
     asyncio.run(main_async())
 
 if __name__ == "__main__":
@@ -5,19 +5,38 @@ This test demonstrates the full workflow without requiring external dependencies
 """
 
 import asyncio
-import json
-from datetime import datetime
+import re
 import sys
+import time
 import os
 
-# Add the current directory to the path so we can import our modules
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+# Add the current directory to the path so we can import our modules, unless it is already there
+# (it is sys.path[0] when this file is run as a script)
+_HERE = os.path.dirname(os.path.abspath(__file__))
+if _HERE not in sys.path:
+    sys.path.append(_HERE)
 
-from utils.database import DatabaseManager
 from utils.companion_agent import CompanionAgent
 from utils.adaptive_questionnaire_agent import AdaptiveQuestionnaireAgent
 from utils.trend_monitoring_agent import TrendMonitoringAgent
-from utils.auth import create_simple_token, get_current_user
+from utils.auth import create_simple_token
+
+# Simulated PRO extraction: each named group is a question_id whose keywords, when present in a
+# patient response, record the canned (response_value, response_type) below. One scan per response.
+PRO_KEYWORDS = re.compile(
+    r"(?P<blood_sugar>blood sugar|(?-i:mg/dL))|(?P<fatigue_level>tired)|(?P<medication_adherence>medication)",
+    re.IGNORECASE
+)
+PRO_VALUES = {
+    "blood_sugar": ("185", "numeric"),
+    "fatigue_level": ("high", "text"),
+    "medication_adherence": ("yes", "boolean"),
+}
+
+def extract_pro(response):
+    """Returns the (question_id, response_value, response_type) tuples a patient response provides"""
+    matched = {match.lastgroup for match in PRO_KEYWORDS.finditer(response)}
+    return [(question_id, *PRO_VALUES[question_id]) for question_id in PRO_VALUES if question_id in matched]
 
 class MockDatabaseManager:
     """Mock database manager for testing without SQLite"""
@@ -27,6 +46,10 @@ class MockDatabaseManager:
         self.sessions = {}
         self.interactions = []
         self.pro_responses = []
+        # Lookup indexes, kept in step with the collections above
+        self.patients_by_email = {}
+        self.interactions_by_session = {}
+        self.pro_responses_by_patient = {}
         self.alerts = []
         self.next_patient_id = 1
         self.next_session_id = 1
@@ -48,8 +71,9 @@ class MockDatabaseManager:
             "medical_history": medical_history,
             "preferred_language": preferred_language,
             "accessibility_needs": accessibility_needs,
-            "created_at": datetime.now().isoformat()
+            "created_at": time.time_ns()
         }
+        self.patients_by_email[email] = self.patients[patient_id]
 
         print(f"👤 Created patient {patient_id}: {email} ({condition})")
         return patient_id
@@ -60,10 +84,7 @@ class MockDatabaseManager:
 
     async def get_patient_by_email(self, email):
         """Get a mock patient by email"""
-        for patient in self.patients.values():
-            if patient["email"] == email:
-                return patient
-        return None
+        return self.patients_by_email.get(email)
 
     async def create_conversation_session(self, patient_id):
         """Create a mock conversation session"""
@@ -73,7 +94,7 @@ class MockDatabaseManager:
         self.sessions[session_id] = {
             "id": session_id,
             "patient_id": patient_id,
-            "start_time": datetime.now().isoformat(),
+            "start_time": time.time_ns(),
             "status": "active"
         }
 
@@ -88,10 +109,11 @@ class MockDatabaseManager:
             "message": message,
             "response": response,
             "agent_type": agent_type,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": time.time_ns()
         }
 
         self.interactions.append(interaction)
+        self.interactions_by_session.setdefault(session_id, []).append(interaction)
         print(f"💭 Stored interaction: {agent_type} agent")
 
     async def store_pro_response(self, patient_id, session_id, question_id, response_value, response_type):
@@ -102,10 +124,11 @@ class MockDatabaseManager:
             "question_id": question_id,
             "response_value": response_value,
             "response_type": response_type,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": time.time_ns()
         }
 
         self.pro_responses.append(pro_response)
+        self.pro_responses_by_patient.setdefault(patient_id, []).append(pro_response)
         print(f"📝 Stored PRO response: {question_id} = {response_value}")
 
     async def create_trend_alert(self, patient_id, alert_type, severity, description):
@@ -115,7 +138,7 @@ class MockDatabaseManager:
             "alert_type": alert_type,
             "severity": severity,
             "description": description,
-            "created_at": datetime.now().isoformat()
+            "created_at": time.time_ns()
         }
 
         self.alerts.append(alert)
@@ -123,11 +146,11 @@ class MockDatabaseManager:
 
     async def get_session_interactions(self, session_id):
         """Get mock session interactions"""
-        return [i for i in self.interactions if i["session_id"] == session_id]
+        return list(self.interactions_by_session.get(session_id, ()))
 
     async def get_patient_pro_data(self, patient_id, days=30):
         """Get mock patient PRO data"""
-        return [r for r in self.pro_responses if r["patient_id"] == patient_id]
+        return list(self.pro_responses_by_patient.get(patient_id, ()))
 
 async def test_multi_agent_system():
     """Test the complete multi-agent system workflow"""
@@ -179,21 +202,13 @@ async def test_multi_agent_system():
     print("\n2️⃣ COMPANION AGENT - CONVERSATION INITIATION")
     print("-" * 40)
 
-    # Start conversation with companion agent
-    session_id = await db_manager.create_conversation_session(patient_id)
-
-    # Get initial message from companion agent
-    initial_message = await companion_agent.get_initial_message(patient)
-    print(f"🤖 Companion Agent: {initial_message}")
-
-    # Store the interaction
-    await db_manager.store_conversation_interaction(
-        session_id=session_id,
-        patient_id=patient_id,
-        message="",
-        response=initial_message,
-        agent_type="companion"
+    # Start conversation with companion agent; the initial message only depends on the patient,
+    # so it is generated while the session is created
+    session_id, initial_message = await asyncio.gather(
+        db_manager.create_conversation_session(patient_id),
+        companion_agent.get_initial_message(patient)
     )
+    print(f"🤖 Companion Agent: {initial_message}")
 
     print("\n3️⃣ PATIENT RESPONSE & EMOTIONAL ANALYSIS")
     print("-" * 40)
@@ -202,8 +217,18 @@ async def test_multi_agent_system():
     patient_message = "I'm feeling a bit tired today and my blood sugar has been running high this week, around 180-200 mg/dL."
     print(f"👤 Patient: {patient_message}")
 
-    # Analyze emotional state
-    emotional_analysis = await companion_agent.detect_emotional_state(patient_message)
+    # Analyze emotional state; the analysis only depends on the patient's message, so the opening
+    # interaction is stored while it runs
+    emotional_analysis, _ = await asyncio.gather(
+        companion_agent.detect_emotional_state(patient_message),
+        db_manager.store_conversation_interaction(
+            session_id=session_id,
+            patient_id=patient_id,
+            message="",
+            response=initial_message,
+            agent_type="companion"
+        )
+    )
     print(f"🧠 Emotional Analysis:")
     print(f"   - State: {emotional_analysis['emotional_state']}")
     print(f"   - Urgency: {emotional_analysis['urgency_level']}")
@@ -239,58 +264,46 @@ async def test_multi_agent_system():
 
     print(f"📋 Adaptive Questionnaire Agent: {questionnaire_response}")
 
-    # Store the interaction
-    await db_manager.store_conversation_interaction(
-        session_id=session_id,
-        patient_id=patient_id,
-        message=patient_response,
-        response=questionnaire_response,
-        agent_type="adaptive_questionnaire"
-    )
-
     # Simulate more PRO data collection
     additional_responses = [
         "My blood sugar this morning was 185 mg/dL",
         "I've been feeling more tired than usual",
         "I've been taking my medication regularly"
     ]
-
-    for i, response in enumerate(additional_responses):
+    for response in additional_responses:
         print(f"👤 Patient: {response}")
 
-        # Extract and store PRO data
-        if "blood sugar" in response.lower() or "mg/dL" in response:
-            await db_manager.store_pro_response(
-                patient_id=patient_id,
-                session_id=session_id,
-                question_id="blood_sugar",
-                response_value="185",
-                response_type="numeric"
-            )
-
-        if "tired" in response.lower():
-            await db_manager.store_pro_response(
+    # Store the interaction and the PRO data extracted from every response; the stores are independent,
+    # so they all run concurrently
+    await asyncio.gather(
+        db_manager.store_conversation_interaction(
+            session_id=session_id,
+            patient_id=patient_id,
+            message=patient_response,
+            response=questionnaire_response,
+            agent_type="adaptive_questionnaire"
+        ),
+        *(
+            db_manager.store_pro_response(
                 patient_id=patient_id,
                 session_id=session_id,
-                question_id="fatigue_level",
-                response_value="high",
-                response_type="text"
-            )
-
-        if "medication" in response.lower():
-            await db_manager.store_pro_response(
-                patient_id=patient_id,
-                session_id=session_id,
-                question_id="medication_adherence",
-                response_value="yes",
-                response_type="boolean"
+                question_id=question_id,
+                response_value=response_value,
+                response_type=response_type
             )
+            for response in additional_responses
+            for question_id, response_value, response_type in extract_pro(response)
+        )
+    )
 
     print("\n5️⃣ TREND MONITORING AGENT - ANALYSIS & INSIGHTS")
     print("-" * 40)
 
-    # Get collected PRO data
-    pro_data = await db_manager.get_patient_pro_data(patient_id)
+    # Get collected PRO data, and the session's interactions for the summary, concurrently
+    pro_data, interactions = await asyncio.gather(
+        db_manager.get_patient_pro_data(patient_id),
+        db_manager.get_session_interactions(session_id)
+    )
     print(f"📊 Collected {len(pro_data)} PRO data points")
 
     # Analyze trends
@@ -322,7 +335,6 @@ async def test_multi_agent_system():
     print(f"🤖 Companion Agent: {completion_message}")
 
     # Session summary
-    interactions = await db_manager.get_session_interactions(session_id)
     print(f"\n📋 Session Summary:")
     print(f"   - Session ID: {session_id}")
     print(f"   - Total Interactions: {len(interactions)}")
@@ -333,9 +345,11 @@ async def test_multi_agent_system():
     key_findings = []
     if trend_analysis.get('risk_score', 0) > 0.5:
         key_findings.append("Elevated risk level detected")
-    if any("blood_sugar" in r.get('question_id', '') for r in pro_data):
+    # Distinct question ids, collected in one pass over the PRO data
+    seen_qids = {r.get('question_id', '') for r in pro_data}
+    if any("blood_sugar" in qid for qid in seen_qids):
         key_findings.append("Blood sugar monitoring data collected")
-    if any("medication" in r.get('question_id', '') for r in pro_data):
+    if any("medication" in qid for qid in seen_qids):
         key_findings.append("Medication adherence assessed")
 
     print(f"   - Key Findings: {len(key_findings)}")
@@ -368,4 +382,12 @@ async def test_multi_agent_system():
     print("The backend system is fully functional and ready to be connected to a React TypeScript frontend.")
 
 if __name__ == "__main__":
+    # Block-buffer the report even on a terminal: it is flushed in a few large writes instead of one per line
+    sys.stdout.reconfigure(line_buffering=False)
+    # uvloop is optional: the test must keep running without external dependencies
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
     asyncio.run(test_multi_agent_system())
@@ -74,6 +74,17 @@ async def startup_event():
     await db_manager.initialize()
     logger.info("Multi-agent system initialized successfully")
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Close the database connections held by the app and each agent"""
+    for manager in (
+        db_manager,
+        companion_agent.db_manager,
+        adaptive_questionnaire_agent.db_manager,
+        trend_monitoring_agent.db_manager,
+    ):
+        manager.close()
+
 # Authentication endpoints
 @app.post("/auth/login")
 async def login_patient(patient_data: PatientLogin):
@@ -100,6 +100,11 @@ class AdaptiveQuestionnaireAgent:
             }
         }
 
+        # Question categories per condition, in template order; built once instead of per question
+        self.question_categories = {
+            condition: tuple(templates) for condition, templates in self.question_templates.items()
+        }
+
         # Patient comprehension and engagement tracking
         self.patient_states = {}
 
@@ -256,10 +261,12 @@ class AdaptiveQuestionnaireAgent:
         """Select the next appropriate question based on condition and patient state"""
         try:
             # Get question templates for the condition
-            templates = self.question_templates.get(condition, self.question_templates.get("diabetes"))
+            if condition not in self.question_templates:
+                condition = "diabetes"
+            templates = self.question_templates[condition]
 
             # Determine question category based on history and state
-            question_categories = list(templates.keys())
+            question_categories = self.question_categories[condition]
 
             # Simple logic: cycle through categories
             question_count = state.get("question_count", 0)
@@ -10,13 +10,14 @@ tokens = {}
 
 def create_simple_token(email: str, date_of_birth: str) -> str:
     """Create a simple token based on email and date of birth"""
-    token_data = f"{email}:{date_of_birth}:{datetime.now().timestamp()}"
+    now = datetime.now()
+    token_data = f"{email}:{date_of_birth}:{now.timestamp()}"
     token = hashlib.sha256(token_data.encode()).hexdigest()
     tokens[token] = {
         "email": email,
         "date_of_birth": date_of_birth,
-        "created_at": datetime.now(),
-        "expires_at": datetime.now() + timedelta(hours=24)
+        "created_at": now,
+        "expires_at": now + timedelta(hours=24)
     }
     return token
 
@@ -1,4 +1,5 @@
 import asyncio
+import functools
 import logging
 from typing import Dict, Any, Optional, List
 from datetime import datetime, timedelta
@@ -6,6 +7,7 @@ import os
 from dotenv import load_dotenv
 import json
 import random
+import re
 
 from .models import Patient, AgentResponse, CheckInSchedule
 from .database import DatabaseManager
@@ -14,6 +16,36 @@ load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+# (emotional_state, urgency_level, keywords) in priority order: the first category with a keyword
+# anywhere in the message wins.
+_EMOTION_KEYWORDS = (
+    ("fatigued", "medium", ("tired", "exhausted", "fatigue", "drained")),
+    ("anxious", "medium", ("anxious", "worried", "stressed", "nervous")),
+    ("depressed", "high", ("sad", "depressed", "down", "hopeless")),
+    ("positive", "low", ("good", "great", "better", "improving")),
+)
+
+# All keywords in one lookahead alternation, one named group per category, so the message is scanned
+# once and overlapping keywords are still seen. Groups are tried in priority order at each position.
+_EMOTION_RE = re.compile("(?=" + "|".join(
+    f"(?P<c{index}>{'|'.join(map(re.escape, keywords))})"
+    for index, (_, _, keywords) in enumerate(_EMOTION_KEYWORDS)
+) + ")")
+
+# Short replies ("fine", "ok", "tired") repeat across turns and patients; results are immutable tuples.
+@functools.lru_cache(maxsize=4096)
+def _classify_emotion(message_lower: str) -> tuple:
+    """Returns (emotional_state, urgency_level) for a lowercased message."""
+    best = len(_EMOTION_KEYWORDS)
+    for match in _EMOTION_RE.finditer(message_lower):
+        best = min(best, int(match.lastgroup[1:]))
+        if best == 0:
+            break
+    if best == len(_EMOTION_KEYWORDS):
+        return "neutral", "low"
+    emotional_state, urgency_level, _ = _EMOTION_KEYWORDS[best]
+    return emotional_state, urgency_level
+
 class CompanionAgent:
     def __init__(self):
         """Initialize the Companion Agent with mock responses for testing"""
@@ -114,23 +146,7 @@ class CompanionAgent:
         """Detect emotional state from patient message"""
         try:
             # Simple keyword-based emotional analysis
-            message_lower = message.lower()
-
-            if any(word in message_lower for word in ['tired', 'exhausted', 'fatigue', 'drained']):
-                emotional_state = "fatigued"
-                urgency_level = "medium"
-            elif any(word in message_lower for word in ['anxious', 'worried', 'stressed', 'nervous']):
-                emotional_state = "anxious"
-                urgency_level = "medium"
-            elif any(word in message_lower for word in ['sad', 'depressed', 'down', 'hopeless']):
-                emotional_state = "depressed"
-                urgency_level = "high"
-            elif any(word in message_lower for word in ['good', 'great', 'better', 'improving']):
-                emotional_state = "positive"
-                urgency_level = "low"
-            else:
-                emotional_state = "neutral"
-                urgency_level = "low"
+            emotional_state, urgency_level = _classify_emotion(message.lower())
 
             return {
                 "emotional_state": emotional_state,
@@ -4,94 +4,108 @@ import json
 from datetime import datetime
 from typing import List, Dict, Any, Optional
 import logging
+import threading
 import uuid
+from contextlib import contextmanager
 
 logger = logging.getLogger(__name__)
 
 class DatabaseManager:
     def __init__(self, db_path: str = "pro_system.db"):
         self.db_path = db_path
+        # Opened on first use and reused by every query; opening a sqlite file per call costs more than most queries here
+        self._conn: Optional[sqlite3.Connection] = None
+        # The connection is shared across threads, so only one query may use it at a time
+        self._lock = threading.Lock()
 
     async def initialize(self):
         """Initialize database tables"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-
-            # Patients table with email and date of birth
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS patients (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    email TEXT UNIQUE NOT NULL,
-                    date_of_birth TEXT NOT NULL,
-                    condition TEXT NOT NULL,
-                    medical_history TEXT,
-                    preferred_language TEXT DEFAULT 'en',
-                    accessibility_needs TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-
-            # Conversation sessions table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS conversation_sessions (
-                    id TEXT PRIMARY KEY,
-                    patient_id INTEGER NOT NULL,
-                    started_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    ended_at TIMESTAMP,
-                    status TEXT DEFAULT 'active',
-                    FOREIGN KEY (patient_id) REFERENCES patients (id)
-                )
-            ''')
-
-            # Conversation interactions table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS conversation_interactions (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    session_id TEXT NOT NULL,
-                    patient_id INTEGER NOT NULL,
-                    message TEXT,
-                    response TEXT,
-                    agent_type TEXT,
-                    timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (session_id) REFERENCES conversation_sessions (id),
-                    FOREIGN KEY (patient_id) REFERENCES patients (id)
-                )
-            ''')
-
-            # PRO responses table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS pro_responses (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    patient_id INTEGER NOT NULL,
-                    session_id TEXT NOT NULL,
-                    question_id TEXT NOT NULL,
-                    response_value TEXT,
-                    response_type TEXT DEFAULT 'text',
-                    timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (patient_id) REFERENCES patients (id),
-                    FOREIGN KEY (session_id) REFERENCES conversation_sessions (id)
-                )
-            ''')
-
-            # Trend alerts table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS trend_alerts (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    patient_id INTEGER NOT NULL,
-                    alert_type TEXT NOT NULL,
-                    severity TEXT NOT NULL,
-                    description TEXT,
-                    triggered_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    resolved_at TIMESTAMP,
-                    status TEXT DEFAULT 'active',
-                    FOREIGN KEY (patient_id) REFERENCES patients (id)
-                )
-            ''')
-
-            conn.commit()
-            conn.close()
+            with self._transaction() as conn:
+                cursor = conn.cursor()
+
+                # Patients table with email and date of birth
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS patients (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        email TEXT UNIQUE NOT NULL,
+                        date_of_birth TEXT NOT NULL,
+                        condition TEXT NOT NULL,
+                        medical_history TEXT,
+                        preferred_language TEXT DEFAULT 'en',
+                        accessibility_needs TEXT,
+                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    )
+                ''')
+
+                # Conversation sessions table
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS conversation_sessions (
+                        id TEXT PRIMARY KEY,
+                        patient_id INTEGER NOT NULL,
+                        started_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        ended_at TIMESTAMP,
+                        status TEXT DEFAULT 'active',
+                        FOREIGN KEY (patient_id) REFERENCES patients (id)
+                    )
+                ''')
+
+                # Conversation interactions table
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS conversation_interactions (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        session_id TEXT NOT NULL,
+                        patient_id INTEGER NOT NULL,
+                        message TEXT,
+                        response TEXT,
+                        agent_type TEXT,
+                        timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        FOREIGN KEY (session_id) REFERENCES conversation_sessions (id),
+                        FOREIGN KEY (patient_id) REFERENCES patients (id)
+                    )
+                ''')
+
+                # PRO responses table
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS pro_responses (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        patient_id INTEGER NOT NULL,
+                        session_id TEXT NOT NULL,
+                        question_id TEXT NOT NULL,
+                        response_value TEXT,
+                        response_type TEXT DEFAULT 'text',
+                        timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        FOREIGN KEY (patient_id) REFERENCES patients (id),
+                        FOREIGN KEY (session_id) REFERENCES conversation_sessions (id)
+                    )
+                ''')
+
+                # Trend alerts table
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS trend_alerts (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        patient_id INTEGER NOT NULL,
+                        alert_type TEXT NOT NULL,
+                        severity TEXT NOT NULL,
+                        description TEXT,
+                        triggered_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        resolved_at TIMESTAMP,
+                        status TEXT DEFAULT 'active',
+                        FOREIGN KEY (patient_id) REFERENCES patients (id)
+                    )
+                ''')
+
+                # History reads filter by session/patient and order by time; these indexes serve them
+                # in order without a table scan or a sort
+                cursor.execute('''
+                    CREATE INDEX IF NOT EXISTS idx_interactions_session_timestamp
+                    ON conversation_interactions (session_id, timestamp)
+                ''')
+                cursor.execute('''
+                    CREATE INDEX IF NOT EXISTS idx_pro_responses_patient_timestamp
+                    ON pro_responses (patient_id, timestamp)
+                ''')
             logger.info("Database initialized successfully")
 
         except Exception as e:
@@ -99,24 +113,39 @@ class DatabaseManager:
             raise
 
     def _get_connection(self):
-        """Get database connection"""
-        return sqlite3.connect(self.db_path)
+        """Get the shared database connection"""
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        return self._conn
+
+    @contextmanager
+    def _transaction(self):
+        """Hold the shared connection for one transaction; commits on success, rolls back on error"""
+        with self._lock:
+            conn = self._get_connection()
+            with conn:
+                yield conn
+
+    def close(self):
+        """Close the shared database connection"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
 
     async def create_patient(self, email: str, date_of_birth: str, condition: str, medical_history: str = "", preferred_language: str = "en", accessibility_needs: Optional[str] = None) -> int:
         """Create a new patient"""
         try:
-            conn = self._get_connection()
-            cursor = conn.cursor()
+            with self._transaction() as conn:
+                cursor = conn.cursor()
 
-            cursor.execute('''
-                INSERT INTO patients (email, date_of_birth, condition, medical_history, preferred_language, accessibility_needs)
-                VALUES (?, ?, ?, ?, ?, ?)
-            ''', (email, date_of_birth, condition, medical_history, preferred_language, accessibility_needs))
+                cursor.execute('''
+                    INSERT INTO patients (email, date_of_birth, condition, medical_history, preferred_language, accessibility_needs)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                ''', (email, date_of_birth, condition, medical_history, preferred_language, accessibility_needs))
 
-            patient_id = cursor.lastrowid
-            conn.commit()
-            conn.close()
-            return patient_id
+                patient_id = cursor.lastrowid
+                return patient_id
 
         except Exception as e:
             logger.error(f"Error creating patient: {e}")
@@ -125,25 +154,24 @@ class DatabaseManager:
     async def get_patient_by_email(self, email: str):
         """Get patient by email"""
         try:
-            conn = self._get_connection()
-            cursor = conn.cursor()
-
-            cursor.execute('SELECT * FROM patients WHERE email = ?', (email,))
-            patient_data = cursor.fetchone()
-            conn.close()
-
-            if patient_data:
-                return {
-                    "id": patient_data[0],
-                    "email": patient_data[1],
-                    "date_of_birth": patient_data[2],
-                    "condition": patient_data[3],
-                    "medical_history": patient_data[4],
-                    "preferred_language": patient_data[5],
-                    "accessibility_needs": patient_data[6],
-                    "created_at": patient_data[7]
-                }
-            return None
+            with self._transaction() as conn:
+                cursor = conn.cursor()
+
+                cursor.execute('SELECT * FROM patients WHERE email = ?', (email,))
+                patient_data = cursor.fetchone()
+
+                if patient_data:
+                    return {
+                        "id": patient_data[0],
+                        "email": patient_data[1],
+                        "date_of_birth": patient_data[2],
+                        "condition": patient_data[3],
+                        "medical_history": patient_data[4],
+                        "preferred_language": patient_data[5],
+                        "accessibility_needs": patient_data[6],
+                        "created_at": patient_data[7]
+                    }
+                return None
 
         except Exception as e:
             logger.error(f"Error getting patient: {e}")
@@ -152,25 +180,24 @@ class DatabaseManager:
     async def get_patient(self, patient_id: int):
         """Get patient by ID"""
         try:
-            conn = self._get_connection()
-            cursor = conn.cursor()
-
-            cursor.execute('SELECT * FROM patients WHERE id = ?', (patient_id,))
-            patient_data = cursor.fetchone()
-            conn.close()
-
-            if patient_data:
-                return {
-                    "id": patient_data[0],
-                    "email": patient_data[1],
-                    "date_of_birth": patient_data[2],
-                    "condition": patient_data[3],
-                    "medical_history": patient_data[4],
-                    "preferred_language": patient_data[5],
-                    "accessibility_needs": patient_data[6],
-                    "created_at": patient_data[7]
-                }
-            return None
+            with self._transaction() as conn:
+                cursor = conn.cursor()
+
+                cursor.execute('SELECT * FROM patients WHERE id = ?', (patient_id,))
+                patient_data = cursor.fetchone()
+
+                if patient_data:
+                    return {
+                        "id": patient_data[0],
+                        "email": patient_data[1],
+                        "date_of_birth": patient_data[2],
+                        "condition": patient_data[3],
+                        "medical_history": patient_data[4],
+                        "preferred_language": patient_data[5],
+                        "accessibility_needs": patient_data[6],
+                        "created_at": patient_data[7]
+                    }
+                return None
 
         except Exception as e:
             logger.error(f"Error getting patient: {e}")
@@ -179,17 +206,14 @@ class DatabaseManager:
     async def update_medical_history(self, patient_id: int, medical_history: str):
         """Update patient's medical history"""
         try:
-            conn = self._get_connection()
-            cursor = conn.cursor()
+            with self._transaction() as conn:
+                cursor = conn.cursor()
 
-            cursor.execute('''
-                UPDATE patients
-                SET medical_history = ?, updated_at = CURRENT_TIMESTAMP
-                WHERE id = ?
-            ''', (medical_history, patient_id))
-
-            conn.commit()
-            conn.close()
+                cursor.execute('''
+                    UPDATE patients
+                    SET medical_history = ?, updated_at = CURRENT_TIMESTAMP
+                    WHERE id = ?
+                ''', (medical_history, patient_id))
 
         except Exception as e:
             logger.error(f"Error updating medical history: {e}")
@@ -199,17 +223,15 @@ class DatabaseManager:
         """Create a new conversation session"""
         try:
             session_id = str(uuid.uuid4())
-            conn = self._get_connection()
-            cursor = conn.cursor()
+            with self._transaction() as conn:
+                cursor = conn.cursor()
 
-            cursor.execute('''
-                INSERT INTO conversation_sessions (id, patient_id)
-                VALUES (?, ?)
-            ''', (session_id, patient_id))
+                cursor.execute('''
+                    INSERT INTO conversation_sessions (id, patient_id)
+                    VALUES (?, ?)
+                ''', (session_id, patient_id))
 
-            conn.commit()
-            conn.close()
-            return session_id
+                return session_id
 
         except Exception as e:
             logger.error(f"Error creating conversation session: {e}")
@@ -218,27 +240,23 @@ class DatabaseManager:
     async def get_conversation_history(self, session_id: str) -> List[Dict[str, Any]]:
         """Get conversation history for a session"""
         try:
-            conn = self._get_connection()
-            cursor = conn.cursor()
-
-            cursor.execute('''
-                SELECT message, response, agent_type, timestamp
-                FROM conversation_interactions
-                WHERE session_id = ?
-                ORDER BY timestamp ASC
-            ''', (session_id,))
-
-            history = []
-            for row in cursor.fetchall():
-                history.append({
-                    "message": row[0],
-                    "response": row[1],
-                    "agent_type": row[2],
-                    "timestamp": row[3]
-                })
-
-            conn.close()
-            return history
+            with self._transaction() as conn:
+                cursor = conn.cursor()
+
+                cursor.execute('''
+                    SELECT message, response, agent_type, timestamp
+                    FROM conversation_interactions
+                    WHERE session_id = ?
+                    ORDER BY timestamp ASC
+                ''', (session_id,))
+
+                # Rows are consumed from the cursor as they are read rather than materialized by fetchall()
+                history = [
+                    {"message": message, "response": response, "agent_type": agent_type, "timestamp": timestamp}
+                    for message, response, agent_type, timestamp in cursor
+                ]
+
+                return history
 
         except Exception as e:
             logger.error(f"Error getting conversation history: {e}")
@@ -247,16 +265,13 @@ class DatabaseManager:
     async def store_conversation_interaction(self, session_id: str, patient_id: int, message: str, response: str, agent_type: str):
         """Store a conversation interaction"""
         try:
-            conn = self._get_connection()
-            cursor = conn.cursor()
-
-            cursor.execute('''
-                INSERT INTO conversation_interactions (session_id, patient_id, message, response, agent_type)
-                VALUES (?, ?, ?, ?, ?)
-            ''', (session_id, patient_id, message, response, agent_type))
+            with self._transaction() as conn:
+                cursor = conn.cursor()
 
-            conn.commit()
-            conn.close()
+                cursor.execute('''
+                    INSERT INTO conversation_interactions (session_id, patient_id, message, response, agent_type)
+                    VALUES (?, ?, ?, ?, ?)
+                ''', (session_id, patient_id, message, response, agent_type))
 
         except Exception as e:
             logger.error(f"Error storing conversation interaction: {e}")
@@ -265,16 +280,13 @@ class DatabaseManager:
     async def store_pro_response(self, patient_id: int, session_id: str, question_id: str, response_value: str, response_type: str = "text"):
         """Store a PRO response"""
         try:
-            conn = self._get_connection()
-            cursor = conn.cursor()
-
-            cursor.execute('''
-                INSERT INTO pro_responses (patient_id, session_id, question_id, response_value, response_type)
-                VALUES (?, ?, ?, ?, ?)
-            ''', (patient_id, session_id, question_id, response_value, response_type))
+            with self._transaction() as conn:
+                cursor = conn.cursor()
 
-            conn.commit()
-            conn.close()
+                cursor.execute('''
+                    INSERT INTO pro_responses (patient_id, session_id, question_id, response_value, response_type)
+                    VALUES (?, ?, ?, ?, ?)
+                ''', (patient_id, session_id, question_id, response_value, response_type))
 
         except Exception as e:
             logger.error(f"Error storing PRO response: {e}")
@@ -283,27 +295,22 @@ class DatabaseManager:
     async def get_patient_pro_data(self, patient_id: int) -> List[Dict[str, Any]]:
         """Get all PRO data for a patient"""
         try:
-            conn = self._get_connection()
-            cursor = conn.cursor()
-
-            cursor.execute('''
-                SELECT question_id, response_value, response_type, timestamp
-                FROM pro_responses
-                WHERE patient_id = ?
-                ORDER BY timestamp ASC
-            ''', (patient_id,))
-
-            pro_data = []
-            for row in cursor.fetchall():
-                pro_data.append({
-                    "question_id": row[0],
-                    "response_value": row[1],
-                    "response_type": row[2],
-                    "timestamp": row[3]
-                })
-
-            conn.close()
-            return pro_data
+            with self._transaction() as conn:
+                cursor = conn.cursor()
+
+                cursor.execute('''
+                    SELECT question_id, response_value, response_type, timestamp
+                    FROM pro_responses
+                    WHERE patient_id = ?
+                    ORDER BY timestamp ASC
+                ''', (patient_id,))
+
+                pro_data = [
+                    {"question_id": question_id, "response_value": response_value, "response_type": response_type, "timestamp": timestamp}
+                    for question_id, response_value, response_type, timestamp in cursor
+                ]
+
+                return pro_data
 
         except Exception as e:
             logger.error(f"Error getting patient PRO data: {e}")
@@ -312,16 +319,13 @@ class DatabaseManager:
     async def create_trend_alert(self, patient_id: int, alert_type: str, severity: str, description: str):
         """Create a trend alert"""
         try:
-            conn = self._get_connection()
-            cursor = conn.cursor()
-
-            cursor.execute('''
-                INSERT INTO trend_alerts (patient_id, alert_type, severity, description)
-                VALUES (?, ?, ?, ?)
-            ''', (patient_id, alert_type, severity, description))
+            with self._transaction() as conn:
+                cursor = conn.cursor()
 
-            conn.commit()
-            conn.close()
+                cursor.execute('''
+                    INSERT INTO trend_alerts (patient_id, alert_type, severity, description)
+                    VALUES (?, ?, ?, ?)
+                ''', (patient_id, alert_type, severity, description))
 
         except Exception as e:
             logger.error(f"Error creating trend alert: {e}")
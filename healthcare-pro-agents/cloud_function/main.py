@@ -1,7 +1,7 @@
-import json
+import orjson
 import os
 from fastapi import FastAPI, Request, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 
 app = FastAPI()
 
@@ -11,23 +11,23 @@ DATA_FILE = os.path.join(os.path.dirname(__file__), "data", "mock_patient_data.j
 @app.post("/lookup_patient_data")
 async def lookup_patient_data(request: Request):
     try:
-        req_json = await request.json()
+        req_json = orjson.loads(await request.body())
         patient_id = req_json.get("patient_id")
 
         if not patient_id:
             raise HTTPException(status_code=400, detail="Missing 'patient_id' in request body.")
 
-        with open(DATA_FILE, "r") as f:
-            all_data = json.load(f)
+        with open(DATA_FILE, "rb") as f:
+            all_data = orjson.loads(f.read())
 
         patient_data = all_data.get(patient_id)
 
         if not patient_data:
             raise HTTPException(status_code=404, detail="Patient not found.")
 
-        return JSONResponse(content=patient_data)
+        return ORJSONResponse(content=patient_data)
 
-    except json.JSONDecodeError:
+    except orjson.JSONDecodeError:
         raise HTTPException(status_code=400, detail="Invalid JSON.")
 
     except Exception as e: